@@ -0,0 +1,86 @@
+# Copyright 2026 Afkham Azeez
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+logger = logging.getLogger(__name__)
+
+# Number of times to retry a failed API call before giving up.
+_MAX_API_RETRIES = 5
+
+# Maximum number of requests sent in one batch HTTP request.  Google's batch
+# endpoints reject batches larger than 50.
+_MAX_BATCH_SIZE = 50
+
+
+def _is_transient(exc: Exception) -> bool:
+    """Return True if exc is an HTTP error worth retrying (429 or 5xx)."""
+    return isinstance(exc, HttpError) and (exc.resp.status == 429 or exc.resp.status >= 500)
+
+
+def execute_batch(service, requests: dict) -> tuple[dict, dict]:
+    """
+    Execute {key: HttpRequest} in batches of at most _MAX_BATCH_SIZE on service.
+
+    Batch HTTP requests are not retried by googleapiclient, so requests that
+    fail with a transient error, and every unfinished request in a batch whose
+    own HTTP call fails, are retried individually with the usual back-off.
+
+    Returns (responses, errors): {key: response} for the requests that
+    succeeded and {key: exception} for those that ultimately failed.
+    """
+    responses = {}
+    errors = {}
+    retry = []
+
+    # Batch request IDs must be strings, so keys are mapped to their position.
+    keys = list(requests)
+
+    def _callback(request_id, response, exception):
+        key = keys[int(request_id)]
+        if exception is None:
+            responses[key] = response
+        elif _is_transient(exception):
+            retry.append(key)
+        else:
+            errors[key] = exception
+
+    for start in range(0, len(keys), _MAX_BATCH_SIZE):
+        chunk = range(start, min(start + _MAX_BATCH_SIZE, len(keys)))
+        batch = service.new_batch_http_request(callback=_callback)
+        for i in chunk:
+            batch.add(requests[keys[i]], request_id=str(i))
+        try:
+            batch.execute()
+        except (HttpError, httplib2.HttpLib2Error, OSError) as exc:
+            unfinished = [
+                keys[i] for i in chunk
+                if keys[i] not in responses and keys[i] not in errors and keys[i] not in retry
+            ]
+            logger.warning(
+                "Batch request failed (%s) — retrying %d request(s) individually.",
+                exc, len(unfinished),
+            )
+            retry.extend(unfinished)
+
+    for key in retry:
+        try:
+            responses[key] = requests[key].execute(num_retries=_MAX_API_RETRIES)
+        except Exception as exc:
+            errors[key] = exc
+
+    return responses, errors
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
 import logging
 import os
 import stat
@@ -22,7 +23,6 @@ from google.auth.exceptions import RefreshError, TransportError
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_httplib2 import AuthorizedHttp
-from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 
 logger = logging.getLogger(__name__)
@@ -37,9 +37,8 @@ logging.getLogger('googleapiclient.discovery_cache').setLevel(logging.ERROR)
 SCOPES = [
     'https://www.googleapis.com/auth/calendar',
     'https://www.googleapis.com/auth/documents.readonly',
-    # drive.readonly is needed to resolve attachment file metadata.
-    'https://www.googleapis.com/auth/drive.readonly',
 ]
+_REQUIRED_SCOPES = frozenset(SCOPES)
 
 CREDENTIALS_PATH = 'credentials.json'
 TOKEN_PATH = 'token.json'
@@ -47,6 +46,11 @@ TOKEN_PATH = 'token.json'
 # Maximum seconds to wait for any single Google API call.
 _API_TIMEOUT_SECONDS = 30
 
+# A cached access token is refreshed up front when it has less than this many
+# seconds left, so it cannot expire part-way through a run.  Tokens with more
+# time left are used as-is: no token endpoint call and no token.json rewrite.
+_REFRESH_MARGIN_SECONDS = 300
+
 
 def _restrict_file_permissions(path: str) -> None:
     """Set file permissions to owner-read/write only (0o600)."""
@@ -60,7 +64,18 @@ def _validate_token_scopes(creds: Credentials) -> bool:
     """Return True if the cached token covers all required scopes."""
     if not creds.scopes:
         return True  # Cannot determine; assume valid (older token format).
-    return set(SCOPES).issubset(set(creds.scopes))
+    return _REQUIRED_SCOPES.issubset(creds.scopes)
+
+
+def _has_fresh_token(creds: Credentials) -> bool:
+    """Return True if creds holds an access token valid for the refresh margin."""
+    if not creds.token:
+        return False
+    if creds.expiry is None:
+        return True  # Token without an expiry; nothing to refresh ahead of.
+    # Credentials.expiry is a naive UTC datetime.
+    now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+    return (creds.expiry - now).total_seconds() >= _REFRESH_MARGIN_SECONDS
 
 
 def _save_token(creds: Credentials) -> None:
@@ -117,12 +132,14 @@ def get_credentials() -> Credentials:
                 pass
             creds = None
 
-    if creds and creds.valid:
+    # A still-fresh cached token is returned untouched: token.json is only
+    # rewritten below, after a refresh or a browser flow has changed it.
+    if creds and _has_fresh_token(creds):
         return creds
 
-    if creds and creds.expired and creds.refresh_token:
+    if creds and creds.refresh_token:
         try:
-            logger.info("Refreshing expired access token.")
+            logger.info("Refreshing expired or expiring access token.")
             creds.refresh(Request())
         except RefreshError:
             logger.warning(
@@ -136,6 +153,10 @@ def get_credentials() -> Credentials:
             raise
 
     if not creds:
+        # Imported here because google_auth_oauthlib pulls in requests_oauthlib
+        # and friends, which a run with a usable cached token never needs.
+        from google_auth_oauthlib.flow import InstalledAppFlow
+
         flow = InstalledAppFlow.from_client_secrets_file(CREDENTIALS_PATH, SCOPES)
         creds = flow.run_local_server(port=0)
         logger.info("Browser authentication completed.")
@@ -145,15 +166,24 @@ def get_credentials() -> Credentials:
 
 
 def build_services(creds: Credentials):
-    """Build and return (calendar_service, docs_service, drive_service).
+    """Build and return (calendar_service, docs_service).
+
+    Both services share one AuthorizedHttp transport with a timeout so that
+    hung API calls do not block indefinitely.  Sharing the underlying
+    httplib2.Http lets calls to the same host reuse an open TLS connection
+    instead of each service performing its own handshake.
 
-    Each service uses an AuthorizedHttp transport with a timeout so that
-    hung API calls do not block indefinitely.
+    httplib2.Http is not thread-safe: callers must not issue requests through
+    these services from more than one thread at a time.
     """
-    def _authorized_http() -> AuthorizedHttp:
-        return AuthorizedHttp(creds, http=httplib2.Http(timeout=_API_TIMEOUT_SECONDS))
+    http = AuthorizedHttp(creds, http=httplib2.Http(timeout=_API_TIMEOUT_SECONDS))
+
+    # Use the discovery documents bundled with googleapiclient rather than
+    # fetching them over HTTPS on every run; the on-disk discovery cache is
+    # redundant when the documents are already local.
+    def _build(name: str, version: str):
+        return build(name, version, http=http, static_discovery=True, cache_discovery=False)
 
-    calendar_svc = build('calendar', 'v3', http=_authorized_http())
-    docs_svc     = build('docs',     'v1', http=_authorized_http())
-    drive_svc    = build('drive',    'v3', http=_authorized_http())
-    return calendar_svc, docs_svc, drive_svc
+    calendar_svc = _build('calendar', 'v3')
+    docs_svc     = _build('docs',     'v1')
+    return calendar_svc, docs_svc
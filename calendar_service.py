@@ -19,6 +19,8 @@ from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 import httplib2
 from googleapiclient.errors import HttpError
 
+import api_batch
+
 logger = logging.getLogger(__name__)
 
 # Hard cap on the number of pagination pages fetched per run.  A typical
@@ -26,16 +28,44 @@ logger = logging.getLogger(__name__)
 # unbounded loop if the API unexpectedly keeps returning page tokens.
 _MAX_PAGES = 100
 
+# Events requested per page.  2500 is the maximum the Calendar API allows
+# (the default is 250), so a whole day normally fits in a single page.
+_PAGE_SIZE = 2500
+
 # Number of times to retry a failed API call before giving up.  The
 # googleapiclient library handles 429 / 5xx / transport errors automatically
 # when num_retries > 0, with exponential back-off.
 _MAX_API_RETRIES = 5
 
+# Partial-response mask for events().list(): only the fields this program
+# reads (filtering, logging, the idempotency guard and doc-ID extraction) are
+# returned, instead of full event resources with attendees, conference data,
+# reminders and so on.
+_EVENT_LIST_FIELDS = (
+    'nextPageToken,'
+    'items(id,status,summary,description,recurringEventId,start/dateTime,'
+    'attachments(fileUrl,mimeType))'
+)
+
+# Last second of the day used as the events().list() upper bound.
+_END_OF_DAY = datetime.time(23, 59, 59)
+
+
+class SafeSummary:
+    """Sanitised event summary for log arguments.
+
+    The repr/truncation is deferred to __str__, so it only runs when a log
+    record is actually formatted.
+    """
 
-def _safe_summary(event: dict) -> str:
-    """Return a sanitised event summary safe to write to logs."""
-    raw = event.get('summary', 'Untitled')
-    return repr(raw[:80])
+    __slots__ = ('_event',)
+
+    def __init__(self, event: dict) -> None:
+        self._event = event
+
+    def __str__(self) -> str:
+        raw = self._event.get('summary', 'Untitled')
+        return repr(raw[:80])
 
 
 def get_user_timezone(calendar_svc) -> str:
@@ -51,8 +81,14 @@ def get_user_timezone(calendar_svc) -> str:
     return tz
 
 
-def get_todays_recurring_events(calendar_svc, today: datetime.date, tz: str) -> list:
-    """Return all recurring event instances scheduled for today in the user's timezone."""
+def get_todays_recurring_events(
+    calendar_svc, today: datetime.date, tz: str, query: str | None = None
+) -> list:
+    """Return all recurring event instances scheduled for today in the user's timezone.
+
+    query, if given, is passed to the API as a free-text search (q) so only
+    matching events are returned.
+    """
     try:
         tz_info = ZoneInfo(tz)
     except ZoneInfoNotFoundError:
@@ -61,8 +97,8 @@ def get_todays_recurring_events(calendar_svc, today: datetime.date, tz: str) ->
         )
         tz_info = ZoneInfo('UTC')
 
-    time_min = datetime.datetime(today.year, today.month, today.day, 0, 0, 0, tzinfo=tz_info).isoformat()
-    time_max = datetime.datetime(today.year, today.month, today.day, 23, 59, 59, tzinfo=tz_info).isoformat()
+    time_min = datetime.datetime.combine(today, datetime.time.min, tzinfo=tz_info).isoformat()
+    time_max = datetime.datetime.combine(today, _END_OF_DAY, tzinfo=tz_info).isoformat()
 
     events = []
     page_token = None
@@ -84,7 +120,10 @@ def get_todays_recurring_events(calendar_svc, today: datetime.date, tz: str) ->
                 timeMax=time_max,
                 singleEvents=True,  # Expands recurring series into individual instances
                 orderBy='startTime',
+                maxResults=_PAGE_SIZE,
                 pageToken=page_token,
+                q=query,
+                fields=_EVENT_LIST_FIELDS,
             ).execute(num_retries=_MAX_API_RETRIES)
         except (HttpError, httplib2.HttpLib2Error, OSError) as exc:
             logger.error(
@@ -95,13 +134,15 @@ def get_todays_recurring_events(calendar_svc, today: datetime.date, tz: str) ->
 
         pages_fetched += 1
 
-        for event in response.get('items', []):
+        for event in response.get('items', ()):
             # Only recurring instances (they have recurringEventId), that are not cancelled,
             # and have a specific time (skip all-day events which only have 'date', not 'dateTime').
+            start = event.get('start')
             if (
                 'recurringEventId' in event
                 and event.get('status') != 'cancelled'
-                and 'dateTime' in event.get('start', {})
+                and start is not None
+                and 'dateTime' in start
             ):
                 events.append(event)
 
@@ -113,37 +154,75 @@ def get_todays_recurring_events(calendar_svc, today: datetime.date, tz: str) ->
     return events
 
 
-def cancel_event_occurrence(calendar_svc, event: dict, note: str) -> None:
-    """Prepend cancellation note to event description, then delete the occurrence for all attendees."""
-    event_id = event['id']
-    summary  = _safe_summary(event)
+def _needs_note(event: dict, note: str) -> bool:
+    """Return True unless the event description already begins with note.
 
+    Idempotency guard: if a previous run patched the description but failed
+    before completing the delete, the PATCH is skipped and the DELETE proceeds
+    directly.  Leading whitespace is ignored, as clients may add it on save.
+    """
     existing_desc = event.get('description', '') or ''
+    return not existing_desc.lstrip().startswith(note)
 
-    # Idempotency guard: if a previous run patched the description but failed
-    # before completing the delete, skip re-patching and go straight to delete.
-    if not existing_desc.startswith(note):
-        new_desc = f"{note}\n\n{existing_desc}".strip()
-        calendar_svc.events().patch(
-            calendarId='primary',
-            eventId=event_id,
-            body={'description': new_desc},
-        ).execute(num_retries=_MAX_API_RETRIES)
 
-    try:
-        calendar_svc.events().delete(
+def _incomplete_reason(patched: bool) -> str:
+    """Describe a failed DELETE, noting whether this run changed the description."""
+    if patched:
+        return "description was updated but the occurrence was NOT deleted"
+    return "the occurrence was NOT deleted (description already carried the note)"
+
+
+def cancel_event_occurrences(calendar_svc, events: list, note: str) -> None:
+    """
+    Cancel several occurrences using batched PATCH and DELETE requests.
+
+    Each event's description gets the cancellation note prepended, then the
+    occurrence is deleted for all attendees.  All the description PATCHes are
+    sent in one round of batches and then all the DELETEs, so N cancellations
+    cost a handful of round-trips instead of 2N.  PATCHes always
+    complete before any DELETE is sent, which keeps the idempotency guard
+    valid if a run stops part-way.
+
+    Failures are logged per event and never affect the other events.
+    """
+    events_by_id = {event['id']: event for event in events}
+
+    patches = {}
+    for event_id, event in events_by_id.items():
+        if _needs_note(event, note):
+            existing_desc = event.get('description', '') or ''
+            patches[event_id] = calendar_svc.events().patch(
+                calendarId='primary',
+                eventId=event_id,
+                body={'description': f"{note}\n\n{existing_desc}".strip()},
+            )
+
+    _, patch_errors = api_batch.execute_batch(calendar_svc, patches)
+    for event_id, exc in patch_errors.items():
+        logger.error(
+            "Could not add the cancellation note to %s (id=%s): %s — not cancelling.",
+            SafeSummary(events_by_id[event_id]), event_id, exc,
+        )
+
+    deletes = {
+        event_id: calendar_svc.events().delete(
             calendarId='primary',
             eventId=event_id,
             sendUpdates='all',
-        ).execute(num_retries=_MAX_API_RETRIES)
-    except Exception:
-        # The description has been updated but the occurrence was NOT deleted.
-        # Log at CRITICAL so an operator can manually cancel the event.
-        logger.critical(
-            "Cancellation of %s (id=%s) is INCOMPLETE: description was updated "
-            "but the occurrence was NOT deleted. Please cancel it manually in Google Calendar.",
-            summary, event_id,
         )
-        raise
-
-    logger.info("Cancelled occurrence of %s (id=%s).", summary, event_id)
+        for event_id in events_by_id
+        if event_id not in patch_errors
+    }
+
+    _, delete_errors = api_batch.execute_batch(calendar_svc, deletes)
+    for event_id in deletes:
+        summary = SafeSummary(events_by_id[event_id])
+        if event_id in delete_errors:
+            logger.critical(
+                "Cancellation of %s (id=%s) is INCOMPLETE: %s [%s]. "
+                "Please cancel it manually in Google Calendar.",
+                summary, event_id, _incomplete_reason(event_id in patches),
+                delete_errors[event_id],
+            )
+        else:
+            logger.info("Cancelled occurrence of %s (id=%s).", summary, event_id)
@@ -15,9 +15,6 @@
 import datetime
 import logging
 
-import httplib2
-from googleapiclient.errors import HttpError
-
 import calendar_service
 import docs_service
 
@@ -26,23 +23,20 @@ logger = logging.getLogger(__name__)
 CANCELLATION_NOTE = "Meeting canceled since there are no topics to be discussed today"
 
 
-def _safe_summary(event: dict) -> str:
-    """Return a sanitised event summary safe to write to logs."""
-    raw = event.get('summary', 'Untitled')
-    return repr(raw[:80])
-
-
-def should_cancel_event(event: dict, docs_svc, today: datetime.date) -> tuple:
+def should_cancel_event(event: dict, prefetched: dict, today: datetime.date) -> tuple:
     """
     Determine whether a recurring event occurrence should be cancelled.
 
+    prefetched is the result of docs_service.fetch_doc_contents() for (at
+    least) this event's docs.
+
     Returns (should_cancel: bool, reason: str) where reason is one of:
       'no_doc'      - no Google Doc attachment found (do NOT cancel)
       'has_topics'  - at least one doc has topics for today (do NOT cancel)
       'no_topics'   - doc(s) found but none have topics for today (DO cancel)
       'doc_error'   - all docs had access errors (do NOT cancel, to be safe)
     """
-    summary = _safe_summary(event)
+    summary = calendar_service.SafeSummary(event)
     doc_ids = docs_service.extract_doc_ids_from_event(event)
 
     if not doc_ids:
@@ -54,16 +48,14 @@ def should_cancel_event(event: dict, docs_svc, today: datetime.date) -> tuple:
     any_doc_read = False
 
     for doc_id in doc_ids:
-        try:
-            content = docs_service.fetch_doc_content(docs_svc, doc_id)
-            any_doc_read = True
-        except (HttpError, httplib2.HttpLib2Error, OSError) as exc:
+        content = prefetched[doc_id]
+        if isinstance(content, Exception):
             logger.error(
                 "Could not read doc for event %s: %s (%s) — skipping this doc.",
-                summary, exc, type(exc).__name__,
+                summary, content, type(content).__name__,
             )
             continue
-
+        any_doc_read = True
         if docs_service.has_topics_for_today(content, today):
             logger.info("%s: topics found — meeting is required.", summary)
             return False, 'has_topics'
@@ -78,15 +70,40 @@ def should_cancel_event(event: dict, docs_svc, today: datetime.date) -> tuple:
     return True, 'no_topics'
 
 
-def process_event(event: dict, calendar_svc, docs_svc, today: datetime.date, dry_run: bool = False) -> None:
-    """Evaluate one recurring event and cancel it if no topics are found."""
-    summary = _safe_summary(event)
-    cancel, reason = should_cancel_event(event, docs_svc, today)
+def process_events(events: list, calendar_svc, docs_svc, today: datetime.date, dry_run: bool = False) -> None:
+    """
+    Evaluate all events, then cancel those with no topics.
 
-    if cancel:
-        if dry_run:
+    The docs attached to all the events are fetched up front in batched Docs
+    requests (each distinct doc once), and the cancellations are sent together
+    as batched Calendar requests.  An error while evaluating one event is
+    logged and does not affect the others.
+    """
+    doc_ids = [
+        doc_id
+        for event in events
+        for doc_id in docs_service.extract_doc_ids_from_event(event)
+    ]
+    prefetched = docs_service.fetch_doc_contents(docs_svc, doc_ids)
+
+    to_cancel = []
+
+    for event in events:
+        summary = calendar_service.SafeSummary(event)
+        try:
+            cancel, reason = should_cancel_event(event, prefetched, today)
+        except Exception:
+            logger.exception(
+                "Error processing event %s — skipping and continuing.", summary
+            )
+            continue
+
+        if not cancel:
+            logger.info("Keeping %s (reason: %s).", summary, reason)
+        elif dry_run:
             logger.info("[DRY RUN] Would cancel %s (reason: %s).", summary, reason)
         else:
-            calendar_service.cancel_event_occurrence(calendar_svc, event, CANCELLATION_NOTE)
-    else:
-        logger.info("Keeping %s (reason: %s).", summary, reason)
+            to_cancel.append(event)
+
+    if to_cancel:
+        calendar_service.cancel_event_occurrences(calendar_svc, to_cancel, CANCELLATION_NOTE)
@@ -15,9 +15,9 @@
 import datetime
 import logging
 import re
+import types
 
-import httplib2
-from googleapiclient.errors import HttpError
+import api_batch
 
 logger = logging.getLogger(__name__)
 
@@ -29,14 +29,30 @@ _DOC_ID_PATTERN = re.compile(r'/document/d/([a-zA-Z0-9_-]+)')
 _MAX_URL_LENGTH    = 2048
 _MAX_DOC_ID_LENGTH = 128
 
-# Number of times to retry a failed API call before giving up.
-_MAX_API_RETRIES = 5
+# Partial-response mask for documents().get(): only the paragraph text and
+# styles that has_topics_for_today() reads.  Document bodies are mostly
+# styling, index and object metadata, so this shrinks the response and its
+# JSON parse cost several-fold.
+_DOC_FIELDS = (
+    'body/content/paragraph('
+    'elements(textRun/content,dateElement/dateElementProperties/displayText,'
+    'richLink/richLinkProperties/title,person/personProperties/name),'
+    'paragraphStyle/namedStyleType)'
+)
 
 # Hard cap on the number of content elements processed per document.  A
 # normal meeting-notes doc has tens to low hundreds of elements; this prevents
 # a pathologically large document from consuming excessive CPU/memory.
 _MAX_CONTENT_ELEMENTS = 10_000
 
+# English month abbreviations used in date headings, indexed by month - 1.
+# Fixed here rather than taken from strftime('%b'), which follows the
+# process locale.
+_MONTH_ABBR = (
+    'Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+    'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec',
+)
+
 # Matches the date prefix in a heading, e.g. "Feb 25, 2026"
 _DATE_PREFIX_RE = re.compile(r'^[A-Z][a-z]{2} \d{1,2}, \d{4}')
 
@@ -46,6 +62,13 @@ _END_SECTION_NAMES = frozenset({
     'notes', 'action items', 'action item', 'next steps', 'next step',
     'attendees', 'attendees:', 'agenda', 'resources', 'follow-up', 'follow up',
 })
+# Longer paragraphs (i.e. most topic bullets) cannot be an end-section name,
+# so they are rejected before lower-casing and hashing them.
+_MAX_END_SECTION_LEN = max(len(name) for name in _END_SECTION_NAMES)
+
+# Read-only empty mapping used as the .get() default for optional nested
+# objects, so that missing keys do not allocate a new dict on every lookup.
+_EMPTY = types.MappingProxyType({})
 
 # Map namedStyleType to a numeric level for hierarchy comparisons.
 # Lower number = higher in the document hierarchy.
@@ -94,12 +117,8 @@ def extract_doc_ids_from_event(event: dict) -> list:
     return doc_ids
 
 
-def fetch_doc_content(docs_svc, doc_id: str) -> list:
-    """Fetch a Google Doc and return its body content list."""
-    doc = docs_svc.documents().get(documentId=doc_id).execute(
-        num_retries=_MAX_API_RETRIES
-    )
-
+def _body_content(doc, doc_id: str) -> list:
+    """Return the body content list of a Docs API document response."""
     if not isinstance(doc, dict):
         logger.error("Unexpected response type from Docs API for doc '%s'.", doc_id)
         return []
@@ -117,10 +136,30 @@ def fetch_doc_content(docs_svc, doc_id: str) -> list:
     return content
 
 
+def fetch_doc_contents(docs_svc, doc_ids) -> dict:
+    """
+    Fetch several Google Docs using batched requests.
+
+    Returns {doc_id: content} where content is the body content list, or the
+    exception raised while fetching that doc.  Duplicate IDs are fetched once.
+    Transient failures are retried as described in
+    api_batch.execute_batch().
+    """
+    doc_ids = list(dict.fromkeys(doc_ids))
+    responses, errors = api_batch.execute_batch(docs_svc, {
+        doc_id: docs_svc.documents().get(documentId=doc_id, fields=_DOC_FIELDS)
+        for doc_id in doc_ids
+    })
+    return {
+        doc_id: errors[doc_id] if doc_id in errors else _body_content(responses[doc_id], doc_id)
+        for doc_id in doc_ids
+    }
+
+
 def build_today_date_prefix(today: datetime.date) -> str:
     """Return today's date formatted as the heading prefix, e.g. 'Feb 25, 2026'."""
     # Use .day integer directly to avoid platform-specific zero-stripping flags.
-    return f"{today.strftime('%b')} {today.day}, {today.year}"
+    return f"{_MONTH_ABBR[today.month - 1]} {today.day}, {today.year}"
 
 
 def _get_paragraph_text(paragraph: dict) -> str:
@@ -133,26 +172,26 @@ def _get_paragraph_text(paragraph: dict) -> str:
       - richLink:    calendar/Drive smart chip (title)
       - person:      @mention (name)
     """
-    parts = []
-    for elem in paragraph.get('elements', []):
-        if 'textRun' in elem:
-            parts.append(elem['textRun'].get('content', ''))
-        elif 'dateElement' in elem:
-            display = elem['dateElement'].get('dateElementProperties', {}).get('displayText', '')
-            parts.append(display)
-        elif 'richLink' in elem:
-            title = elem['richLink'].get('richLinkProperties', {}).get('title', '')
-            parts.append(title)
-        elif 'person' in elem:
-            name = elem['person'].get('personProperties', {}).get('name', '')
-            parts.append(name)
-    return ''.join(parts).strip()
-
-
-def _heading_level(paragraph: dict) -> int:
-    """Return the numeric heading level of a paragraph (99 = normal text)."""
-    style = paragraph.get('paragraphStyle', {}).get('namedStyleType', 'NORMAL_TEXT')
-    return _HEADING_LEVELS.get(style, 99)
+    # Most paragraphs have one to three elements, for which appending to a
+    # str is cheaper than building a list and joining it.
+    text = ''
+    for elem in paragraph.get('elements', ()):
+        text_run = elem.get('textRun')
+        if text_run is not None:
+            text += text_run.get('content', '')
+            continue
+        date_element = elem.get('dateElement')
+        if date_element is not None:
+            text += date_element.get('dateElementProperties', _EMPTY).get('displayText', '')
+            continue
+        rich_link = elem.get('richLink')
+        if rich_link is not None:
+            text += rich_link.get('richLinkProperties', _EMPTY).get('title', '')
+            continue
+        person = elem.get('person')
+        if person is not None:
+            text += person.get('personProperties', _EMPTY).get('name', '')
+    return text.strip()
 
 
 def has_topics_for_today(content: list, today: datetime.date) -> bool:
@@ -193,22 +232,32 @@ def has_topics_for_today(content: list, today: datetime.date) -> bool:
             )
             break
 
-        if 'paragraph' not in element:
+        para = element.get('paragraph')
+        if para is None:
             # Skip sectionBreak, table, etc.
             continue
 
-        para  = element['paragraph']
-        text  = _get_paragraph_text(para)
-        level = _heading_level(para)
+        # Numeric heading level (99 = normal text), looked up inline as this
+        # runs for every paragraph.
+        style = para.get('paragraphStyle', _EMPTY).get('namedStyleType', 'NORMAL_TEXT')
+        level = _HEADING_LEVELS.get(style, 99)
         is_heading = level < 99
 
         if state == STATE_SEARCHING_DATE:
-            if is_heading and text.startswith(date_prefix):
+            # Only a heading can open today's section, so body paragraphs
+            # are skipped without assembling their text.
+            if not is_heading:
+                continue
+            text = _get_paragraph_text(para)
+            if text.startswith(date_prefix):
                 date_heading_level = level
                 state = STATE_SEARCHING_TOPICS
                 logger.debug("Found today's date heading (level %d).", level)
+            continue
+
+        text = _get_paragraph_text(para)
 
-        elif state == STATE_SEARCHING_TOPICS:
+        if state == STATE_SEARCHING_TOPICS:
             if is_heading:
                 # A heading at strictly higher hierarchy means we've left the entire date section.
                 if level < date_heading_level:
@@ -236,7 +285,7 @@ def has_topics_for_today(content: list, today: datetime.date) -> bool:
                     return False
             # A known end-section name (Notes, Action items, etc.) ends the Topics section
             # regardless of whether it is a heading or normal/bold text.
-            if text.lower() in _END_SECTION_NAMES:
+            if len(text) <= _MAX_END_SECTION_LEN and text.lower() in _END_SECTION_NAMES:
                 logger.debug("Left 'Topics' sub-section (end section encountered).")
                 return False
             # Any other non-empty text is a topic item.
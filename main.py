@@ -24,12 +24,16 @@ Usage:
 """
 
 import argparse
+import atexit
 import datetime
 import logging
 import logging.handlers
 import os
+import queue
 import stat
 import sys
+import tempfile
+import time
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 import auth
@@ -43,8 +47,21 @@ _LOG_BACKUP_COUNT = 5
 
 LAST_SUCCESS_PATH = 'last_success.txt'
 
+TIMEZONE_CACHE_PATH = 'timezone_cache.txt'
+# How long the cached calendar timezone is trusted before it is re-read from
+# the Calendar API.  The setting rarely changes; delete the file to force a
+# re-read (e.g. right after changing the calendar's timezone).
+_TIMEZONE_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# Source of the current time, called with the user's tzinfo.  Tests replace it
+# to pin "today" instead of depending on the wall clock.
+_clock = datetime.datetime.now
+
 
 def configure_logging() -> None:
+    if logging.getLogger().handlers:
+        return  # Already configured (e.g. by a test runner); as basicConfig() would.
+
     fmt = '%(asctime)s %(levelname)-8s %(name)s: %(message)s'
     handlers: list[logging.Handler] = [logging.StreamHandler(sys.stdout)]
     file_log_error: OSError | None = None
@@ -63,7 +80,22 @@ def configure_logging() -> None:
         # is visible rather than producing a bare Python traceback.
         file_log_error = exc
 
-    logging.basicConfig(level=logging.INFO, format=fmt, handlers=handlers)
+    for handler in handlers:
+        handler.setFormatter(logging.Formatter(fmt))
+
+    # The real handlers run on a background thread, so log calls made while
+    # events are processed only enqueue the record instead of waiting on
+    # console and disk I/O.  The QueueHandler merges the message and any
+    # traceback before enqueueing; the target handlers add the rest.
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    listener = logging.handlers.QueueListener(log_queue, *handlers)
+    listener.start()
+    # Flush queued records before exit, including after sys.exit().
+    atexit.register(listener.stop)
+
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
 
     if file_log_error:
         logging.getLogger(__name__).warning(
@@ -79,14 +111,6 @@ def configure_logging() -> None:
         pass
 
 
-def _safe_summary(event: dict) -> str:
-    """Return a sanitised event summary safe to write to logs."""
-    raw = event.get('summary', 'Untitled')
-    # Truncate to 80 chars and use repr() to neutralise any embedded newlines
-    # or control characters that could enable log injection.
-    return repr(raw[:80])
-
-
 def _read_last_success() -> datetime.date | None:
     """Return the date stored in LAST_SUCCESS_PATH, or None if absent/unreadable."""
     try:
@@ -108,6 +132,41 @@ def _write_last_success(today: datetime.date) -> None:
         )
 
 
+def _read_cached_timezone() -> str | None:
+    """Return the timezone in TIMEZONE_CACHE_PATH, or None if absent, stale or invalid."""
+    try:
+        if time.time() - os.path.getmtime(TIMEZONE_CACHE_PATH) > _TIMEZONE_CACHE_TTL_SECONDS:
+            return None
+        with open(TIMEZONE_CACHE_PATH) as f:
+            tz = f.read().strip()
+        ZoneInfo(tz)
+    except (OSError, ValueError, ZoneInfoNotFoundError):
+        return None
+    return tz
+
+
+def _write_cached_timezone(tz: str) -> None:
+    """Write tz to TIMEZONE_CACHE_PATH atomically, restricted to owner r/w."""
+    cache_dir = os.path.dirname(os.path.abspath(TIMEZONE_CACHE_PATH))
+    try:
+        tmp_fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(tmp_fd, 'w') as f:
+                f.write(tz)
+            os.chmod(tmp_path, stat.S_IRUSR | stat.S_IWUSR)
+            os.replace(tmp_path, TIMEZONE_CACHE_PATH)  # atomic on POSIX
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+    except OSError as exc:
+        logging.getLogger(__name__).warning(
+            "Could not write '%s': %s", TIMEZONE_CACHE_PATH, exc
+        )
+
+
 def main() -> None:
     configure_logging()
     logger = logging.getLogger(__name__)
@@ -129,18 +188,21 @@ def main() -> None:
 
     try:
         creds = auth.get_credentials()
-        calendar_svc, docs_svc, _ = auth.build_services(creds)
+        calendar_svc, docs_svc = auth.build_services(creds)
 
-        tz_string = calendar_service.get_user_timezone(calendar_svc)
+        tz_string = _read_cached_timezone()
+        if tz_string is None:
+            tz_string = calendar_service.get_user_timezone(calendar_svc)
+            _write_cached_timezone(tz_string)
         logger.info("User timezone: %s", tz_string)
 
         try:
-            today = datetime.datetime.now(ZoneInfo(tz_string)).date()
+            today = _clock(ZoneInfo(tz_string)).date()
         except ZoneInfoNotFoundError:
             logger.warning(
                 "Unknown timezone '%s' from Calendar API; falling back to UTC.", tz_string
             )
-            today = datetime.datetime.now(ZoneInfo('UTC')).date()
+            today = _clock(ZoneInfo('UTC')).date()
 
         if not args.dry_run and _read_last_success() == today:
             logger.info(
@@ -155,16 +217,9 @@ def main() -> None:
         if not events:
             logger.info("No recurring meetings today — nothing to do.")
         else:
-            for event in events:
-                try:
-                    canceller.process_event(
-                        event, calendar_svc, docs_svc, today, dry_run=args.dry_run
-                    )
-                except Exception:
-                    logger.exception(
-                        "Error processing event %s — skipping and continuing.",
-                        _safe_summary(event),
-                    )
+            canceller.process_events(
+                events, calendar_svc, docs_svc, today, dry_run=args.dry_run
+            )
 
     except FileNotFoundError as exc:
         logger.error("%s", exc)
@@ -18,8 +18,6 @@ Integration tests for recurring-meeting-optimizer.
 Test cases:
   TC-01  Recurring  + doc WITH topics            → KEEP   (topics found)
   TC-02  Recurring  + doc NO topics              → CANCEL (no topics)
-  TC-03  Non-recurring + doc, no topics          → KEEP   (not recurring, ignored)
-  TC-04  Recurring  + NO doc attached            → KEEP   (no doc, skipped)
   TC-05  Recurring  + doc has today heading but NO Topics section
                                                  → CANCEL (state machine finds no topics)
   TC-06  Recurring  + doc has only past-date entries (no today heading)
@@ -30,6 +28,9 @@ Test cases:
   TC-09  All-day recurring + doc no topics       → KEEP   (all-day events filtered out)
   TC-10  Idempotency: already-cancelled occurrence is not re-processed on 2nd optimizer pass
 
+TC-03 (one-off event → KEEP) and TC-04 (recurring, no doc → KEEP) need no
+API call to decide, so they are unit tests (UT-30, UT-31 in test_unit.py).
+
 Usage:
   python test_integration.py
 
@@ -43,11 +44,15 @@ import time
 import logging
 from zoneinfo import ZoneInfo
 
+import httplib2
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 
+import api_batch
+import auth
 import calendar_service as cal_module
 import canceller
 import docs_service
@@ -64,14 +69,24 @@ TEST_SCOPES = [
 TEST_TOKEN_PATH = 'test_token.json'
 CREDENTIALS_PATH = 'credentials.json'
 
+# Number of times to retry a failed API call before giving up.  The
+# googleapiclient library retries 429 / 5xx / transport errors with
+# randomised exponential back-off when num_retries > 0.
+_MAX_API_RETRIES = 5
+
 
 def _get_test_credentials() -> Credentials:
+    """
+    Return test credentials whose access token outlives the optimizer's
+    refresh margin (auth._REFRESH_MARGIN_SECONDS), refreshing it up front
+    otherwise so it cannot expire part-way through the run.
+    """
     import os
     creds = None
     if os.path.exists(TEST_TOKEN_PATH):
         creds = Credentials.from_authorized_user_file(TEST_TOKEN_PATH, TEST_SCOPES)
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
+    if not creds or not auth._has_fresh_token(creds):
+        if creds and creds.refresh_token:
             creds.refresh(Request())
         else:
             flow = InstalledAppFlow.from_client_secrets_file(CREDENTIALS_PATH, TEST_SCOPES)
@@ -82,9 +97,18 @@ def _get_test_credentials() -> Credentials:
 
 
 def _build_services(creds):
-    cal  = build('calendar', 'v3',  credentials=creds)
-    docs = build('docs',     'v1',  credentials=creds)
-    drv  = build('drive',    'v3',  credentials=creds)
+    # All three services share one transport, so they reuse one connection
+    # instead of each opening its own.  The discovery documents bundled with
+    # googleapiclient are used instead of fetching one over HTTPS per service
+    # on every run.
+    http = AuthorizedHttp(creds, http=httplib2.Http(timeout=auth._API_TIMEOUT_SECONDS))
+
+    def _build(name: str, version: str):
+        return build(name, version, http=http, static_discovery=True, cache_discovery=False)
+
+    cal  = _build('calendar', 'v3')
+    docs = _build('docs',     'v1')
+    drv  = _build('drive',    'v3')
     return cal, docs, drv
 
 
@@ -92,16 +116,56 @@ def _build_services(creds):
 # Setup helpers
 # ---------------------------------------------------------------------------
 
-def _create_doc(
+# Meeting-template bodies for the test docs; {heading} is the dated heading.
+_DOC_BODY_WITH_TOPICS = (
+    "{heading}\n"
+    "Attendees: Test User\n"
+    "\n"
+    "Topic:\n"
+    "- Integration test topic 1\n"
+    "- Integration test topic 2\n"
+    "\n"
+    "Notes\n"
+    "\n"
+    "Action items\n"
+)
+_DOC_BODY_NO_TOPICS = (
+    "{heading}\n"
+    "Attendees: Test User\n"
+    "\n"
+    "Topic:\n"
+    "\n"
+    "Notes\n"
+    "\n"
+    "Action items\n"
+)
+# No Topics section at all (TC-05).
+_DOC_BODY_NO_TOPICS_SECTION = (
+    "{heading}\n"
+    "Attendees: Test User\n"
+    "\n"
+    "Notes\n"
+    "\n"
+    "Action items\n"
+)
+
+
+def _create_doc_request(docs_svc, title: str):
+    """Return the request creating an empty Google Doc titled '[TEST] <title>'."""
+    return docs_svc.documents().create(body={'title': f'[TEST] {title}'})
+
+
+def _fill_doc_request(
     docs_svc,
+    doc_id: str,
     title: str,
     today: datetime.date,
     include_topics: bool = True,
     include_topics_section: bool = True,
     heading_date: datetime.date | None = None,
-) -> str:
+):
     """
-    Create a Google Doc using the meeting template structure.
+    Return the request filling a doc with the meeting template structure.
 
     Args:
         include_topics:         Whether to list items under the Topics section.
@@ -109,55 +173,22 @@ def _create_doc(
                                 Set False to omit it entirely (TC-05).
         heading_date:           Date to use in the heading. Defaults to today.
                                 Set to a past date to simulate old entries (TC-06).
-
-    Returns the document ID.
     """
     date_for_heading = heading_date if heading_date is not None else today
-    date_prefix = f"{date_for_heading.strftime('%b')} {date_for_heading.day}, {date_for_heading.year}"
-    heading_text = f"{date_prefix} | {title}"
-
-    if include_topics_section:
-        if include_topics:
-            body_text = (
-                f"{heading_text}\n"
-                "Attendees: Test User\n"
-                "\n"
-                "Topic:\n"
-                "- Integration test topic 1\n"
-                "- Integration test topic 2\n"
-                "\n"
-                "Notes\n"
-                "\n"
-                "Action items\n"
-            )
-        else:
-            body_text = (
-                f"{heading_text}\n"
-                "Attendees: Test User\n"
-                "\n"
-                "Topic:\n"
-                "\n"
-                "Notes\n"
-                "\n"
-                "Action items\n"
-            )
+    # Same formatter the optimizer matches headings with, so the two cannot
+    # drift apart (and the month name does not depend on the locale).
+    heading_text = f"{docs_service.build_today_date_prefix(date_for_heading)} | {title}"
+
+    if not include_topics_section:
+        body_text = _DOC_BODY_NO_TOPICS_SECTION.format(heading=heading_text)
+    elif include_topics:
+        body_text = _DOC_BODY_WITH_TOPICS.format(heading=heading_text)
     else:
-        # No Topics section at all (TC-05).
-        body_text = (
-            f"{heading_text}\n"
-            "Attendees: Test User\n"
-            "\n"
-            "Notes\n"
-            "\n"
-            "Action items\n"
-        )
-
-    doc = docs_svc.documents().create(body={'title': f'[TEST] {title}'}).execute()
-    doc_id = doc['documentId']
+        body_text = _DOC_BODY_NO_TOPICS.format(heading=heading_text)
 
     heading_end = 1 + len(heading_text) + 1  # +1 offset, +1 for trailing \n
 
-    docs_svc.documents().batchUpdate(
+    return docs_svc.documents().batchUpdate(
         documentId=doc_id,
         body={
             'requests': [
@@ -176,41 +207,26 @@ def _create_doc(
                 },
             ]
         },
-    ).execute()
-
-    return doc_id
+    )
 
 
-def _create_event(
+def _create_event_request(
     cal_svc,
     summary: str,
     doc_ids: list[str] | None,
     is_recurring: bool,
-    today: datetime.date,
-    tz: str,
-    all_day: bool = False,
-) -> str:
+    start: dict,
+    end: dict,
+):
     """
-    Create a calendar event for today.
+    Return the request creating a calendar event.
 
     Args:
         doc_ids:    List of Google Doc IDs to attach. None or empty = no attachment.
-        all_day:    If True, creates an all-day event (uses 'date' not 'dateTime').
-
-    Returns the base event ID.
+        start, end: Calendar API start/end objects, built once per run: either
+                    {'dateTime', 'timeZone'} or, for all-day events, {'date'}.
     """
-    tz_info = ZoneInfo(tz)
-
-    body: dict = {'summary': summary}
-
-    if all_day:
-        body['start'] = {'date': today.isoformat()}
-        body['end']   = {'date': (today + datetime.timedelta(days=1)).isoformat()}
-    else:
-        start = datetime.datetime(today.year, today.month, today.day, 22, 0, 0, tzinfo=tz_info)
-        end   = datetime.datetime(today.year, today.month, today.day, 22, 30, 0, tzinfo=tz_info)
-        body['start'] = {'dateTime': start.isoformat(), 'timeZone': tz}
-        body['end']   = {'dateTime': end.isoformat(),   'timeZone': tz}
+    body: dict = {'summary': summary, 'start': start, 'end': end}
 
     if is_recurring:
         body['recurrence'] = ['RRULE:FREQ=WEEKLY;COUNT=4']
@@ -225,75 +241,123 @@ def _create_event(
             for did in doc_ids
         ]
 
-    event = cal_svc.events().insert(
+    return cal_svc.events().insert(
         calendarId='primary',
         body=body,
-        supportsAttachments=True,
-    ).execute()
-
-    return event['id']
+        supportsAttachments=bool(doc_ids),
+    )
 
 
 # ---------------------------------------------------------------------------
 # Verification helpers
 # ---------------------------------------------------------------------------
 
-def _get_instance_status(cal_svc, base_id: str, today: datetime.date, tz: str, is_recurring: bool) -> str:
-    """Return the status of today's occurrence of an event."""
-    if not is_recurring:
-        event = cal_svc.events().get(calendarId='primary', eventId=base_id).execute()
-        return event.get('status', 'confirmed')
-
-    tz_info = ZoneInfo(tz)
-    time_min = datetime.datetime(today.year, today.month, today.day, 0,  0,  0,  tzinfo=tz_info).isoformat()
-    time_max = datetime.datetime(today.year, today.month, today.day, 23, 59, 59, tzinfo=tz_info).isoformat()
+def _wait_for_events(
+    cal_svc,
+    today: datetime.date,
+    tz: str,
+    expected_ids: set[str],
+    absent_ids: set[str] = frozenset(),
+    timeout: float = 10.0,
+    interval: float = 0.25,
+) -> list:
+    """
+    Poll today's recurring [TEST] events until the Calendar API reflects our changes.
 
-    response = cal_svc.events().list(
-        calendarId='primary',
-        timeMin=time_min,
-        timeMax=time_max,
-        singleEvents=True,
-        showDeleted=True,
-    ).execute()
+    Returns as soon as every base event ID in expected_ids has an occurrence
+    in the listing and none in absent_ids does, or once timeout seconds have
+    passed.  The interval doubles after each attempt.
 
-    for event in response.get('items', []):
-        if event.get('recurringEventId') == base_id:
-            return event.get('status', 'confirmed')
+    Returns the last listing, so the caller can use it without another query.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        events = cal_module.get_todays_recurring_events(cal_svc, today, tz, query='[TEST]')
+        seen = {e.get('recurringEventId') for e in events}
+        remaining = deadline - time.monotonic()
+        if (expected_ids <= seen and not absent_ids & seen) or remaining <= 0:
+            return events
+        time.sleep(min(interval, remaining))
+        interval *= 2
+
+
+def _fetch_today_instances(cal_svc, time_min: str, time_max: str) -> dict[str, dict]:
+    """
+    Return the event instances between time_min and time_max (ISO 8601),
+    including cancelled ones, in one listing.
 
-    return 'not_found'
+    Each instance is keyed by its recurringEventId, or by its own ID for a
+    non-recurring event, so every test case's base event ID maps to its
+    occurrence today.
+    """
+    instances = {}
+    page_token = None
+    while True:
+        response = cal_svc.events().list(
+            calendarId='primary',
+            timeMin=time_min,
+            timeMax=time_max,
+            singleEvents=True,
+            showDeleted=True,
+            maxResults=2500,
+            pageToken=page_token,
+            fields='nextPageToken,items(id,status,recurringEventId)',
+        ).execute(num_retries=_MAX_API_RETRIES)
+        for event in response.get('items', []):
+            instances[event.get('recurringEventId', event['id'])] = event
+        page_token = response.get('nextPageToken')
+        if not page_token:
+            return instances
 
 
 # ---------------------------------------------------------------------------
 # Cleanup
 # ---------------------------------------------------------------------------
 
+def _delete_all(service, deletes: dict) -> dict:
+    """Run the delete requests as one batch; return {key: exception} for failures."""
+    if not deletes:
+        return {}
+    try:
+        _, errors = api_batch.execute_batch(service, deletes)
+    except Exception as exc:
+        errors = dict.fromkeys(deletes, exc)
+    return errors
+
+
 def _cleanup(cal_svc, drive_svc, base_event_ids: dict, doc_ids: dict) -> None:
+    """
+    Delete the test events and docs with one batch request per service.
+    """
     print('\n--- Cleanup ---')
-    for tc, eid in base_event_ids.items():
-        try:
-            cal_svc.events().delete(
-                calendarId='primary',
-                eventId=eid,
-                sendUpdates='none',
-            ).execute()
-            print(f'  Deleted event  {tc}: {eid}')
-        except Exception as exc:
-            print(f'  Could not delete event {tc} ({eid}): {exc}')
-
+    event_deletes = {
+        tc: cal_svc.events().delete(calendarId='primary', eventId=eid, sendUpdates='none')
+        for tc, eid in base_event_ids.items()
+    }
+    doc_deletes = {}
     for tc, did in doc_ids.items():
         if isinstance(did, list):
             for i, d in enumerate(did):
-                try:
-                    drive_svc.files().delete(fileId=d).execute()
-                    print(f'  Deleted doc    {tc}[{i}]: {d}')
-                except Exception as exc:
-                    print(f'  Could not delete doc {tc}[{i}] ({d}): {exc}')
+                doc_deletes[(f'{tc}[{i}]', d)] = drive_svc.files().delete(fileId=d)
+        else:
+            doc_deletes[(tc, did)] = drive_svc.files().delete(fileId=did)
+
+    # The services share one httplib2.Http, so the batches run one after
+    # the other.
+    event_errors = _delete_all(cal_svc, event_deletes)
+    doc_errors   = _delete_all(drive_svc, doc_deletes)
+
+    for tc, eid in base_event_ids.items():
+        if tc in event_errors:
+            print(f'  Could not delete event {tc} ({eid}): {event_errors[tc]}')
         else:
-            try:
-                drive_svc.files().delete(fileId=did).execute()
-                print(f'  Deleted doc    {tc}: {did}')
-            except Exception as exc:
-                print(f'  Could not delete doc {tc} ({did}): {exc}')
+            print(f'  Deleted event  {tc}: {eid}')
+
+    for tc, d in doc_deletes:
+        if (tc, d) in doc_errors:
+            print(f'  Could not delete doc {tc} ({d}): {doc_errors[(tc, d)]}')
+        else:
+            print(f'  Deleted doc    {tc}: {d}')
 
 
 # ---------------------------------------------------------------------------
@@ -312,127 +376,162 @@ def run_tests() -> int:
     cal_svc, docs_svc_obj, drive_svc = _build_services(creds)
 
     tz    = cal_module.get_user_timezone(cal_svc)
-    today = datetime.datetime.now(ZoneInfo(tz)).date()
+    tz_info = ZoneInfo(tz)
+    today = datetime.datetime.now(tz_info).date()
     yesterday = today - datetime.timedelta(days=7)  # use last week for "past date" tests
     print(f'Timezone : {tz}')
     print(f'Today    : {today}')
 
+    # Today's window in the user's timezone, for the verification listing.
+    time_min = datetime.datetime(today.year, today.month, today.day, 0,  0,  0,  tzinfo=tz_info).isoformat()
+    time_max = datetime.datetime(today.year, today.month, today.day, 23, 59, 59, tzinfo=tz_info).isoformat()
+
+    # Event times shared by every test event: 22:00-22:30 today, or all day.
+    timed_start = {
+        'dateTime': datetime.datetime.combine(today, datetime.time(22, 0), tzinfo=tz_info).isoformat(),
+        'timeZone': tz,
+    }
+    timed_end = {
+        'dateTime': datetime.datetime.combine(today, datetime.time(22, 30), tzinfo=tz_info).isoformat(),
+        'timeZone': tz,
+    }
+    all_day_start = {'date': today.isoformat()}
+    all_day_end   = {'date': (today + datetime.timedelta(days=1)).isoformat()}
+
     base_event_ids: dict[str, str] = {}
     doc_ids: dict = {}  # values may be str or list[str]
 
     # ------------------------------------------------------------------ Setup
-    print('\n--- Creating test events and docs ---')
-    try:
+    # Docs per TC: (title, options for _fill_doc_request).
+    doc_specs = {
         # TC-01: Recurring + doc WITH topics → KEEP
-        doc_ids['tc01'] = _create_doc(docs_svc_obj, '[TEST] Recurring with topics', today, include_topics=True)
-        base_event_ids['tc01'] = _create_event(cal_svc, '[TEST] Recurring with topics',
-            [doc_ids['tc01']], is_recurring=True, today=today, tz=tz)
-        print(f'  TC-01  recurring, doc+topics             event={base_event_ids["tc01"]}')
-
+        'tc01': [('[TEST] Recurring with topics', {})],
         # TC-02: Recurring + doc WITHOUT topics → CANCEL
-        doc_ids['tc02'] = _create_doc(docs_svc_obj, '[TEST] Recurring no topics', today, include_topics=False)
-        base_event_ids['tc02'] = _create_event(cal_svc, '[TEST] Recurring no topics',
-            [doc_ids['tc02']], is_recurring=True, today=today, tz=tz)
-        print(f'  TC-02  recurring, doc+no topics          event={base_event_ids["tc02"]}')
-
-        # TC-03: Non-recurring + doc WITHOUT topics → KEEP
-        doc_ids['tc03'] = _create_doc(docs_svc_obj, '[TEST] One-off no topics', today, include_topics=False)
-        base_event_ids['tc03'] = _create_event(cal_svc, '[TEST] One-off no topics',
-            [doc_ids['tc03']], is_recurring=False, today=today, tz=tz)
-        print(f'  TC-03  non-recurring, doc+no topics      event={base_event_ids["tc03"]}')
-
-        # TC-04: Recurring + NO doc → KEEP
-        base_event_ids['tc04'] = _create_event(cal_svc, '[TEST] Recurring no doc',
-            None, is_recurring=True, today=today, tz=tz)
-        print(f'  TC-04  recurring, no doc                 event={base_event_ids["tc04"]}')
-
+        'tc02': [('[TEST] Recurring no topics', {'include_topics': False})],
         # TC-05: Recurring + doc with today's heading but NO Topics section → CANCEL
-        doc_ids['tc05'] = _create_doc(docs_svc_obj, '[TEST] No topics section', today,
-            include_topics_section=False)
-        base_event_ids['tc05'] = _create_event(cal_svc, '[TEST] No topics section',
-            [doc_ids['tc05']], is_recurring=True, today=today, tz=tz)
-        print(f'  TC-05  recurring, doc+no topics section  event={base_event_ids["tc05"]}')
-
+        'tc05': [('[TEST] No topics section', {'include_topics_section': False})],
         # TC-06: Recurring + doc with only past-date entries (no today heading) → CANCEL
-        doc_ids['tc06'] = _create_doc(docs_svc_obj, '[TEST] Past date only', today,
-            include_topics=True, heading_date=yesterday)
-        base_event_ids['tc06'] = _create_event(cal_svc, '[TEST] Past date only',
-            [doc_ids['tc06']], is_recurring=True, today=today, tz=tz)
-        print(f'  TC-06  recurring, doc+past date only     event={base_event_ids["tc06"]}')
-
+        'tc06': [('[TEST] Past date only', {'heading_date': yesterday})],
         # TC-07: Recurring + two docs (first no topics, second has topics) → KEEP
-        doc_ids['tc07'] = [
-            _create_doc(docs_svc_obj, '[TEST] Two docs A no topics', today, include_topics=False),
-            _create_doc(docs_svc_obj, '[TEST] Two docs B with topics', today, include_topics=True),
-        ]
-        base_event_ids['tc07'] = _create_event(cal_svc, '[TEST] Two docs one with topics',
-            doc_ids['tc07'], is_recurring=True, today=today, tz=tz)
-        print(f'  TC-07  recurring, 2 docs (no+yes topics) event={base_event_ids["tc07"]}')
-
+        'tc07': [
+            ('[TEST] Two docs A no topics', {'include_topics': False}),
+            ('[TEST] Two docs B with topics', {}),
+        ],
         # TC-08: Recurring + two docs (both no topics) → CANCEL
-        doc_ids['tc08'] = [
-            _create_doc(docs_svc_obj, '[TEST] Two docs both no topics A', today, include_topics=False),
-            _create_doc(docs_svc_obj, '[TEST] Two docs both no topics B', today, include_topics=False),
-        ]
-        base_event_ids['tc08'] = _create_event(cal_svc, '[TEST] Two docs both no topics',
-            doc_ids['tc08'], is_recurring=True, today=today, tz=tz)
-        print(f'  TC-08  recurring, 2 docs (both no topics) event={base_event_ids["tc08"]}')
-
+        'tc08': [
+            ('[TEST] Two docs both no topics A', {'include_topics': False}),
+            ('[TEST] Two docs both no topics B', {'include_topics': False}),
+        ],
         # TC-09: All-day recurring + doc no topics → KEEP (all-day filtered out)
-        doc_ids['tc09'] = _create_doc(docs_svc_obj, '[TEST] All-day no topics', today, include_topics=False)
-        base_event_ids['tc09'] = _create_event(cal_svc, '[TEST] All-day recurring',
-            [doc_ids['tc09']], is_recurring=True, today=today, tz=tz, all_day=True)
-        print(f'  TC-09  all-day recurring, doc+no topics  event={base_event_ids["tc09"]}')
-
+        'tc09': [('[TEST] All-day no topics', {'include_topics': False})],
         # TC-10: Idempotency — recurring no topics; verify not re-processed after cancellation
-        doc_ids['tc10'] = _create_doc(docs_svc_obj, '[TEST] Idempotency check', today, include_topics=False)
-        base_event_ids['tc10'] = _create_event(cal_svc, '[TEST] Idempotency check',
-            [doc_ids['tc10']], is_recurring=True, today=today, tz=tz)
-        print(f'  TC-10  recurring, no topics (idempotency) event={base_event_ids["tc10"]}')
+        'tc10': [('[TEST] Idempotency check', {'include_topics': False})],
+    }
+    # Events: (tc key, summary, is_recurring, all_day, setup log label).
+    event_specs = [
+        ('tc01', '[TEST] Recurring with topics',   True,  False, 'recurring, doc+topics            '),
+        ('tc02', '[TEST] Recurring no topics',     True,  False, 'recurring, doc+no topics         '),
+        ('tc05', '[TEST] No topics section',       True,  False, 'recurring, doc+no topics section '),
+        ('tc06', '[TEST] Past date only',          True,  False, 'recurring, doc+past date only    '),
+        ('tc07', '[TEST] Two docs one with topics', True, False, 'recurring, 2 docs (no+yes topics)'),
+        ('tc08', '[TEST] Two docs both no topics', True,  False, 'recurring, 2 docs (both no topics)'),
+        ('tc09', '[TEST] All-day recurring',       True,  True,  'all-day recurring, doc+no topics '),
+        ('tc10', '[TEST] Idempotency check',       True,  False, 'recurring, no topics (idempotency)'),
+    ]
+
+    # Setup runs as three batch requests — doc creates, then doc contents,
+    # then event inserts — instead of one round-trip per API call.
+    print('\n--- Creating test events and docs ---')
+    try:
+        doc_keys = [(tc, i) for tc, specs in doc_specs.items() for i in range(len(specs))]
+
+        created, errors = api_batch.execute_batch(docs_svc_obj, {
+            (tc, i): _create_doc_request(docs_svc_obj, doc_specs[tc][i][0])
+            for tc, i in doc_keys
+        })
+        for tc, specs in doc_specs.items():
+            ids = [created[(tc, i)]['documentId'] for i in range(len(specs)) if (tc, i) in created]
+            if ids:
+                doc_ids[tc] = ids if len(specs) > 1 else ids[0]
+        if errors:
+            raise next(iter(errors.values()))
+
+        _, errors = api_batch.execute_batch(docs_svc_obj, {
+            (tc, i): _fill_doc_request(
+                docs_svc_obj, created[(tc, i)]['documentId'],
+                doc_specs[tc][i][0], today, **doc_specs[tc][i][1],
+            )
+            for tc, i in doc_keys
+        })
+        if errors:
+            raise next(iter(errors.values()))
+
+        inserted, errors = api_batch.execute_batch(cal_svc, {
+            tc: _create_event_request(
+                cal_svc, summary,
+                [created[(tc, i)]['documentId'] for i in range(len(doc_specs.get(tc, ())))],
+                is_recurring=is_recurring,
+                start=all_day_start if all_day else timed_start,
+                end=all_day_end if all_day else timed_end,
+            )
+            for tc, summary, is_recurring, all_day, _ in event_specs
+        })
+        for tc, event in inserted.items():
+            base_event_ids[tc] = event['id']
+        if errors:
+            raise next(iter(errors.values()))
+
+        for tc, _, _, _, label in event_specs:
+            print(f'  TC-{tc[2:]}  {label} event={base_event_ids[tc]}')
 
     except Exception as exc:
         print(f'\nSetup failed: {exc}')
         _cleanup(cal_svc, drive_svc, base_event_ids, doc_ids)
         return 1
 
-    print('\nWaiting 5 s for Calendar API propagation...')
-    time.sleep(5)
+    # Every timed recurring event must be listed before the optimizer runs
+    # (TC-09 is all-day, so it never is).
+    listed_tcs = {
+        tc for tc, _, is_recurring, all_day, _ in event_specs if is_recurring and not all_day
+    }
+    # Exact summaries of our events, to pick them out of the user's calendar.
+    test_summaries = frozenset(summary for _, summary, _, _, _ in event_specs)
 
     # ------------------------------------------------------------------ Run optimizer (pass 1)
     print('\n--- Running optimizer (pass 1) ---')
     try:
-        all_recurring = cal_module.get_todays_recurring_events(cal_svc, today, tz)
-        test_recurring = [e for e in all_recurring if e.get('summary', '').startswith('[TEST]')]
+        print('  Waiting for Calendar API propagation...')
+        all_recurring = _wait_for_events(
+            cal_svc, today, tz, {base_event_ids[tc] for tc in listed_tcs}
+        )
+        test_recurring = [e for e in all_recurring if e.get('summary') in test_summaries]
         print(f'  Test recurring events found: {len(test_recurring)}')
 
-        for event in test_recurring:
-            try:
-                canceller.process_event(event, cal_svc, docs_svc_obj, today, dry_run=False)
-            except Exception as exc:
-                print(f'  Error processing {event.get("summary")}: {exc}')
+        # Same entry point as main.py: docs are fetched in batches and the
+        # cancellations are batched; per-event errors are logged and skipped.
+        canceller.process_events(test_recurring, cal_svc, docs_svc_obj, today, dry_run=False)
 
     except Exception as exc:
         print(f'\nOptimizer run failed: {exc}')
         _cleanup(cal_svc, drive_svc, base_event_ids, doc_ids)
         return 1
 
-    time.sleep(3)
-
     # ------------------------------------------------------------------ Run optimizer (pass 2, idempotency)
     print('\n--- Running optimizer (pass 2 — idempotency check) ---')
     try:
-        all_recurring_pass2 = cal_module.get_todays_recurring_events(cal_svc, today, tz)
-        test_recurring_pass2 = [e for e in all_recurring_pass2 if e.get('summary', '').startswith('[TEST]')]
+        # Poll until every expected cancellation is visible, so neither this
+        # pass nor the verification below races propagation (on timeout the
+        # affected TCs fail below).
+        cancelled_tcs = ('tc02', 'tc05', 'tc06', 'tc08', 'tc10')
+        all_recurring_pass2 = _wait_for_events(
+            cal_svc, today, tz, set(), absent_ids={base_event_ids[tc] for tc in cancelled_tcs}
+        )
+        test_recurring_pass2 = [e for e in all_recurring_pass2 if e.get('summary') in test_summaries]
         print(f'  Test recurring events found in pass 2: {len(test_recurring_pass2)}')
 
-        tc10_found_in_pass2 = any(
-            e.get('recurringEventId') == base_event_ids['tc10']
-            for e in test_recurring_pass2
-        )
-        tc09_found_in_pass2 = any(
-            e.get('recurringEventId') == base_event_ids['tc09']
-            for e in test_recurring_pass2
-        )
+        pass2_recurring_ids = {e.get('recurringEventId') for e in test_recurring_pass2}
+        tc10_found_in_pass2 = base_event_ids['tc10'] in pass2_recurring_ids
+        tc09_found_in_pass2 = base_event_ids['tc09'] in pass2_recurring_ids
     except Exception as exc:
         print(f'\nPass 2 run failed: {exc}')
         _cleanup(cal_svc, drive_svc, base_event_ids, doc_ids)
@@ -444,21 +543,21 @@ def run_tests() -> int:
     print('  ' + '-' * 90)
 
     test_cases = [
-        # label,                                              tc key, is_recurring, expect_cancelled
-        ('TC-01  Recurring  + doc WITH topics           ', 'tc01', True,  False),
-        ('TC-02  Recurring  + doc NO topics             ', 'tc02', True,  True),
-        ('TC-03  Non-recurring + doc, no topics         ', 'tc03', False, False),
-        ('TC-04  Recurring  + NO doc attached           ', 'tc04', True,  False),
-        ('TC-05  Recurring  + doc, no Topics section    ', 'tc05', True,  True),
-        ('TC-06  Recurring  + doc, past date only       ', 'tc06', True,  True),
-        ('TC-07  Recurring  + 2 docs (no+yes topics)    ', 'tc07', True,  False),
-        ('TC-08  Recurring  + 2 docs (both no topics)   ', 'tc08', True,  True),
-        ('TC-09  All-day recurring + doc, no topics     ', 'tc09', True,  False),
+        # label,                                              tc key, expect_cancelled
+        ('TC-01  Recurring  + doc WITH topics           ', 'tc01', False),
+        ('TC-02  Recurring  + doc NO topics             ', 'tc02', True),
+        ('TC-05  Recurring  + doc, no Topics section    ', 'tc05', True),
+        ('TC-06  Recurring  + doc, past date only       ', 'tc06', True),
+        ('TC-07  Recurring  + 2 docs (no+yes topics)    ', 'tc07', False),
+        ('TC-08  Recurring  + 2 docs (both no topics)   ', 'tc08', True),
+        ('TC-09  All-day recurring + doc, no topics     ', 'tc09', False),
     ]
 
+    instances = _fetch_today_instances(cal_svc, time_min, time_max)
+
     results = []
-    for label, tc, is_recurring, expect_cancelled in test_cases:
-        status             = _get_instance_status(cal_svc, base_event_ids[tc], today, tz, is_recurring)
+    for label, tc, expect_cancelled in test_cases:
+        status             = instances.get(base_event_ids[tc], {}).get('status', 'not_found')
         actually_cancelled = (status == 'cancelled')
         passed             = (actually_cancelled == expect_cancelled)
         results.append(passed)
@@ -476,10 +575,8 @@ def run_tests() -> int:
     print(f'  {"TC-10  Idempotency (cancelled not re-queried) ":<50} {"KEEP":<12} {tc10_got:<22} {tc10_result}')
 
     # TC-09 extra check: all-day event must NOT appear in either pass
-    tc09_in_pass1 = any(
-        e.get('recurringEventId') == base_event_ids['tc09']
-        for e in test_recurring
-    )
+    pass1_recurring_ids = {e.get('recurringEventId') for e in test_recurring}
+    tc09_in_pass1 = base_event_ids['tc09'] in pass1_recurring_ids
     if tc09_in_pass1:
         print('  TC-09  WARN: all-day event appeared in pass-1 query (unexpected)')
 
@@ -19,10 +19,18 @@ No Google credentials required — all Google API calls are mocked.
 
 Test groups:
   UT-01..04  has_topics_for_today() — pure doc-parsing logic
-  UT-05..07  canceller.should_cancel_event() — error handling paths
-  UT-08..09  calendar_service.cancel_event_occurrence() — partial-failure & idempotency
+  UT-05..07  canceller.process_events() — doc error handling paths
+  UT-30      calendar_service.get_todays_recurring_events() — filtering & search query (was integration TC-03)
+  UT-08..09  calendar_service.cancel_event_occurrences() — partial-failure & idempotency
+  UT-18..19  calendar_service.cancel_event_occurrences() — batched cancellation
+  UT-25      calendar_service.cancel_event_occurrences() — whitespace-tolerant note guard
+  UT-26..27  docs_service.fetch_doc_contents() / canceller.process_events() — batched doc fetch
+  UT-31      canceller.process_events() — event without a doc (was integration TC-04)
   UT-10..11  docs_service.extract_doc_ids_from_event() — URL validation
   UT-12      auth.get_credentials() — corrupt token recovery
+  UT-20..21  auth.get_credentials() — cached token reuse & refresh margin
+  UT-14..16  main.main() — run-once-per-day guard
+  UT-23..24  main timezone cache
 
 Usage:
   python test_unit.py
@@ -33,6 +41,7 @@ import datetime
 import json
 import os
 import tempfile
+import time
 import unittest
 from unittest.mock import MagicMock, patch, call, mock_open
 
@@ -70,6 +79,20 @@ SECTION_BREAK = {'sectionBreak': {}}
 TODAY = datetime.date(2026, 2, 26)
 DATE_HEADING = 'Feb 26, 2026 | Team Sync'
 
+# Shared content elements.  The code under test only reads doc content, so
+# the same dicts can appear in every test's list.
+TODAY_HEADING = _heading(DATE_HEADING)
+TOPICS_HEADER = _para('Topic:')
+
+# A doc with one topic listed for today.
+GOOD_CONTENT = [
+    SECTION_BREAK,
+    TODAY_HEADING,
+    TOPICS_HEADER,
+    _para('- Real topic'),
+    _para('Notes'),
+]
+
 
 # ---------------------------------------------------------------------------
 # UT-01 .. UT-04  has_topics_for_today
@@ -84,9 +107,9 @@ class TestHasTopicsForToday(unittest.TestCase):
         """UT-01: Topics section with only blank lines → False."""
         content = [
             SECTION_BREAK,
-            _heading(DATE_HEADING),
+            TODAY_HEADING,
             _para('Attendees: Alice'),
-            _para('Topic:'),
+            TOPICS_HEADER,
             _para(''),       # blank line — must NOT count as a topic
             _para('   '),    # whitespace only — must NOT count
             _para('Notes'),
@@ -98,11 +121,11 @@ class TestHasTopicsForToday(unittest.TestCase):
         """UT-02: Topic items appearing before the next date heading are found → True."""
         content = [
             SECTION_BREAK,
-            _heading(DATE_HEADING),
-            _para('Topic:'),
+            TODAY_HEADING,
+            TOPICS_HEADER,
             _para('- Discuss Q2 plan'),           # real topic item
             _heading('Feb 19, 2026 | Team Sync'),  # previous week's entry
-            _para('Topic:'),
+            TOPICS_HEADER,
             _para('- Old topic'),
         ]
         self.assertTrue(self._call(content))
@@ -111,9 +134,9 @@ class TestHasTopicsForToday(unittest.TestCase):
         """UT-03: Today's heading immediately followed by a new date heading → False."""
         content = [
             SECTION_BREAK,
-            _heading(DATE_HEADING),
+            TODAY_HEADING,
             _heading('Feb 19, 2026 | Team Sync'),  # next entry with no content for today
-            _para('Topic:'),
+            TOPICS_HEADER,
             _para('- Old topic'),
         ]
         self.assertFalse(self._call(content))
@@ -122,7 +145,7 @@ class TestHasTopicsForToday(unittest.TestCase):
         """UT-13: Today's date heading present but NO Topics section at all → False (cancel)."""
         content = [
             SECTION_BREAK,
-            _heading(DATE_HEADING),        # today's date heading IS present
+            TODAY_HEADING,                 # today's date heading IS present
             _para('Attendees: Alice, Bob'),
             _para(''),
             _para('Notes'),                # no Topics section anywhere
@@ -145,7 +168,7 @@ class TestHasTopicsForToday(unittest.TestCase):
             with self.subTest(variant=variant):
                 content = [
                     SECTION_BREAK,
-                    _heading(DATE_HEADING),
+                    TODAY_HEADING,
                     _para(variant),
                     _para('- An agenda item'),
                     _para('Notes'),
@@ -154,7 +177,7 @@ class TestHasTopicsForToday(unittest.TestCase):
 
 
 # ---------------------------------------------------------------------------
-# UT-05 .. UT-07  canceller.should_cancel_event
+# UT-05 .. UT-07  canceller.process_events — doc error handling
 # ---------------------------------------------------------------------------
 
 def _make_event(doc_ids: list[str]) -> dict:
@@ -179,116 +202,252 @@ def _http_error(status: int) -> HttpError:
     return HttpError(resp=resp, content=b'error')
 
 
-class TestShouldCancelEvent(unittest.TestCase):
+class _FakeBatch:
+    """Stand-in for BatchHttpRequest that records requests and fails chosen ones."""
 
-    def test_ut05_doc_permission_denied_returns_doc_error(self):
-        """UT-05: 403 HttpError on doc fetch → (False, 'doc_error') — safe side."""
-        mock_docs = MagicMock()
-        mock_docs.documents.return_value.get.return_value.execute.side_effect = _http_error(403)
+    def __init__(self, callback, executed: list, failures: dict, responses: dict | None = None):
+        self._callback = callback
+        self._executed = executed
+        self._failures = failures
+        self._responses = responses or {}
+        self._requests = []
 
-        event = _make_event(['doc_abc123'])
-        should_cancel, reason = canceller.should_cancel_event(event, mock_docs, TODAY)
+    def add(self, request, request_id):
+        self._requests.append((request_id, request))
 
-        self.assertFalse(should_cancel)
-        self.assertEqual(reason, 'doc_error')
+    def execute(self):
+        for request_id, request in self._requests:
+            self._executed.append(request)
+            exc = self._failures.get(request)
+            self._callback(request_id, None if exc else self._responses.get(request, {}), exc)
 
-    def test_ut06_network_error_on_doc_fetch_returns_doc_error(self):
-        """UT-06: httplib2.HttpLib2Error (network drop) → (False, 'doc_error')."""
-        mock_docs = MagicMock()
-        mock_docs.documents.return_value.get.return_value.execute.side_effect = (
-            httplib2.HttpLib2Error("connection reset")
+
+def _fake_docs_svc(contents: dict, failures: dict, executed: list):
+    """Return a fake Docs service whose requests are ('get', documentId) tuples."""
+    svc = MagicMock()
+    svc.documents.return_value.get.side_effect = lambda documentId, **kwargs: ('get', documentId)
+    responses = {
+        ('get', doc_id): {'body': {'content': content}}
+        for doc_id, content in contents.items()
+    }
+    svc.new_batch_http_request.side_effect = (
+        lambda callback: _FakeBatch(callback, executed, failures, responses)
+    )
+    return svc
+
+
+class TestDocErrorHandling(unittest.TestCase):
+
+    def _assert_kept(self, event: dict, docs_svc, reason: str) -> None:
+        """Run process_events() on event and check it is kept for reason."""
+        with patch('calendar_service.cancel_event_occurrences') as mock_cancel:
+            with self.assertLogs('canceller', level='INFO') as log_ctx:
+                canceller.process_events([event], MagicMock(), docs_svc, TODAY)
+
+        mock_cancel.assert_not_called()
+        self.assertTrue(
+            any(f'(reason: {reason})' in msg for msg in log_ctx.output),
+            f"Expected the event to be kept with reason '{reason}'",
         )
 
-        event = _make_event(['doc_abc123'])
-        should_cancel, reason = canceller.should_cancel_event(event, mock_docs, TODAY)
+    def test_ut05_doc_permission_denied_returns_doc_error(self):
+        """UT-05: 403 HttpError on doc fetch → kept with 'doc_error' — safe side."""
+        svc = _fake_docs_svc({}, {('get', 'doc_abc123'): _http_error(403)}, [])
+        self._assert_kept(_make_event(['doc_abc123']), svc, 'doc_error')
 
-        self.assertFalse(should_cancel)
-        self.assertEqual(reason, 'doc_error')
+    def test_ut06_network_error_on_doc_fetch_returns_doc_error(self):
+        """UT-06: httplib2.HttpLib2Error (network drop) on batch and retry → kept with 'doc_error'."""
+        network_error = httplib2.HttpLib2Error("connection reset")
+        svc = MagicMock()
+        svc.documents.return_value.get.return_value.execute.side_effect = network_error
+        svc.new_batch_http_request.return_value.execute.side_effect = network_error
+
+        self._assert_kept(_make_event(['doc_abc123']), svc, 'doc_error')
 
     def test_ut07_one_bad_doc_one_good_doc_returns_has_topics(self):
-        """UT-07: First doc → 403; second doc → has topics → (False, 'has_topics')."""
-        good_content = [
-            SECTION_BREAK,
-            _heading(DATE_HEADING),
-            _para('Topic:'),
-            _para('- Real topic'),
-            _para('Notes'),
-        ]
+        """UT-07: First doc → 403; second doc → has topics → kept with 'has_topics'."""
+        svc = _fake_docs_svc({'doc_good': GOOD_CONTENT}, {('get', 'doc_bad'): _http_error(403)}, [])
+        self._assert_kept(_make_event(['doc_bad', 'doc_good']), svc, 'has_topics')
 
-        call_count = 0
 
-        def execute_side_effect(num_retries=0):
-            nonlocal call_count
-            call_count += 1
-            if call_count == 1:
-                raise _http_error(403)
-            # Second call: return a valid doc structure.
-            return {
-                'body': {'content': good_content}
-            }
+# ---------------------------------------------------------------------------
+# UT-30  calendar_service.get_todays_recurring_events
+# ---------------------------------------------------------------------------
 
-        mock_docs = MagicMock()
-        mock_docs.documents.return_value.get.return_value.execute.side_effect = execute_side_effect
+class TestGetTodaysRecurringEvents(unittest.TestCase):
 
-        event = _make_event(['doc_bad', 'doc_good'])
-        should_cancel, reason = canceller.should_cancel_event(event, mock_docs, TODAY)
+    def test_ut30_query_is_sent_as_q_and_only_timed_recurring_events_kept(self):
+        """UT-30: query is forwarded as q; one-off and all-day events are filtered out."""
+        timed = {'id': 'a_1', 'recurringEventId': 'a', 'start': {'dateTime': '2026-02-26T22:00:00Z'}}
+        items = [
+            timed,
+            {'id': 'b', 'start': {'dateTime': '2026-02-26T22:00:00Z'}},               # not recurring
+            {'id': 'c_1', 'recurringEventId': 'c', 'start': {'date': '2026-02-26'}},  # all-day
+        ]
+        mock_cal = MagicMock()
+        mock_list = mock_cal.events.return_value.list
+        mock_list.return_value.execute.return_value = {'items': items}
+
+        events = calendar_service.get_todays_recurring_events(mock_cal, TODAY, 'UTC', query='[TEST]')
 
-        self.assertFalse(should_cancel)
-        self.assertEqual(reason, 'has_topics')
+        self.assertEqual(events, [timed])
+        self.assertEqual(mock_list.call_args.kwargs['q'], '[TEST]')
 
 
 # ---------------------------------------------------------------------------
-# UT-08 .. UT-09  calendar_service.cancel_event_occurrence
+# UT-08 .. UT-09, UT-18 .. UT-19  calendar_service.cancel_event_occurrences
 # ---------------------------------------------------------------------------
 
-class TestCancelEventOccurrence(unittest.TestCase):
+class TestCancelEventOccurrences(unittest.TestCase):
 
-    def _make_cal_svc(self):
-        """Return a MagicMock that behaves like a Calendar service."""
+    def _make_cal_svc(self, failures: dict):
+        """Return a fake Calendar service whose requests are (method, eventId) tuples."""
         svc = MagicMock()
-        # Default: both patch and delete succeed.
-        svc.events.return_value.patch.return_value.execute.return_value = {}
-        svc.events.return_value.delete.return_value.execute.return_value = {}
+        svc.events.return_value.patch.side_effect = lambda **kw: ('patch', kw['eventId'])
+        svc.events.return_value.delete.side_effect = lambda **kw: ('delete', kw['eventId'])
+        self.executed = []
+        svc.new_batch_http_request.side_effect = (
+            lambda callback: _FakeBatch(callback, self.executed, failures)
+        )
         return svc
 
-    def test_ut08_delete_fails_after_patch_logs_critical_and_reraises(self):
-        """UT-08: DELETE raises after PATCH succeeds → CRITICAL logged, exception propagated."""
-        svc = self._make_cal_svc()
-        svc.events.return_value.delete.return_value.execute.side_effect = _http_error(500)
-
-        event = {'id': 'evt001', 'summary': 'Meeting', 'description': ''}
+    def test_ut08_delete_fails_after_patch_logs_critical(self):
+        """UT-08: DELETE fails after PATCH succeeds → CRITICAL logged with 'INCOMPLETE'."""
+        svc = self._make_cal_svc({('delete', 'evt001'): _http_error(403)})
+        events = [{'id': 'evt001', 'summary': 'Meeting', 'description': ''}]
 
         with self.assertLogs('calendar_service', level='CRITICAL') as log_ctx:
-            with self.assertRaises(HttpError):
-                calendar_service.cancel_event_occurrence(svc, event, CANCELLATION_NOTE)
+            calendar_service.cancel_event_occurrences(svc, events, CANCELLATION_NOTE)
 
+        self.assertEqual(self.executed, [('patch', 'evt001'), ('delete', 'evt001')])
         self.assertTrue(
-            any('INCOMPLETE' in msg for msg in log_ctx.output),
+            any('INCOMPLETE' in msg and 'description was updated' in msg for msg in log_ctx.output),
             "Expected a CRITICAL log containing 'INCOMPLETE'",
         )
 
     def test_ut09_idempotency_guard_skips_patch_when_note_already_present(self):
-        """UT-09: Note already in description → patch skipped, delete still called."""
-        svc = self._make_cal_svc()
-
-        event = {
+        """UT-09: Note already in description → patch skipped, delete still sent."""
+        svc = self._make_cal_svc({})
+        events = [{
             'id': 'evt002',
             'summary': 'Meeting',
             'description': CANCELLATION_NOTE + '\n\nOriginal description',
-        }
+        }]
 
-        calendar_service.cancel_event_occurrence(svc, event, CANCELLATION_NOTE)
+        calendar_service.cancel_event_occurrences(svc, events, CANCELLATION_NOTE)
 
-        # patch must NOT have been called.
-        svc.events.return_value.patch.assert_not_called()
-        # delete must have been called exactly once.
-        svc.events.return_value.delete.assert_called_once()
+        self.assertEqual(self.executed, [('delete', 'evt002')])
+
+    def test_ut18_batched_patches_precede_deletes_and_failures_are_isolated(self):
+        """UT-18: All PATCHes run before DELETEs; one failed DELETE is CRITICAL, others succeed."""
+        svc = self._make_cal_svc({('delete', 'evt_b'): _http_error(403)})
+        events = [
+            {'id': 'evt_a', 'summary': 'A', 'description': ''},
+            {'id': 'evt_b', 'summary': 'B', 'description': ''},
+        ]
+
+        with self.assertLogs('calendar_service', level='INFO') as log_ctx:
+            calendar_service.cancel_event_occurrences(svc, events, CANCELLATION_NOTE)
+
+        self.assertEqual(
+            self.executed,
+            [('patch', 'evt_a'), ('patch', 'evt_b'), ('delete', 'evt_a'), ('delete', 'evt_b')],
+        )
+        critical = [msg for msg in log_ctx.output if msg.startswith('CRITICAL')]
+        self.assertEqual(len(critical), 1)
+        self.assertIn('evt_b', critical[0])
+        self.assertTrue(any('Cancelled occurrence' in msg and 'evt_a' in msg for msg in log_ctx.output))
+
+    def test_ut19_failed_patch_skips_delete_for_that_event(self):
+        """UT-19: A PATCH that fails is not followed by a DELETE for that event."""
+        svc = self._make_cal_svc({('patch', 'evt_a'): _http_error(404)})
+        events = [
+            {'id': 'evt_a', 'summary': 'A', 'description': ''},
+            {'id': 'evt_b', 'summary': 'B', 'description': CANCELLATION_NOTE},
+        ]
+
+        with self.assertLogs('calendar_service', level='ERROR'):
+            calendar_service.cancel_event_occurrences(svc, events, CANCELLATION_NOTE)
+
+        # evt_b already carries the note, so only its DELETE is sent.
+        self.assertEqual(self.executed, [('patch', 'evt_a'), ('delete', 'evt_b')])
+
+    def test_ut25_note_guard_ignores_leading_whitespace(self):
+        """UT-25: No PATCH when the note is already there behind leading whitespace."""
+        svc = self._make_cal_svc({('delete', 'evt_a'): _http_error(403)})
+        events = [{'id': 'evt_a', 'summary': 'A', 'description': f'\n  {CANCELLATION_NOTE}'}]
+
+        with self.assertLogs('calendar_service', level='CRITICAL') as logs:
+            calendar_service.cancel_event_occurrences(svc, events, CANCELLATION_NOTE)
+
+        self.assertEqual(self.executed, [('delete', 'evt_a')])
+        # No PATCH was sent, so the log must not claim the description changed.
+        self.assertNotIn('description was updated', logs.output[0])
+
+
+# ---------------------------------------------------------------------------
+# UT-26 .. UT-27, UT-31  batched doc fetching (docs_service.fetch_doc_contents /
+#                         canceller.process_events)
+# ---------------------------------------------------------------------------
+
+class TestBatchedDocFetch(unittest.TestCase):
+
+    def _make_docs_svc(self, contents: dict, failures: dict):
+        """Return a fake Docs service that records requests in self.executed."""
+        self.executed = []
+        return _fake_docs_svc(contents, failures, self.executed)
+
+    def test_ut26_fetch_doc_contents_dedupes_and_records_errors(self):
+        """UT-26: Each distinct doc is requested once; a 403 is returned as that doc's result."""
+        content = [SECTION_BREAK, TODAY_HEADING]
+        svc = self._make_docs_svc({'doc_a': content}, {('get', 'doc_b'): _http_error(403)})
+
+        results = docs_service.fetch_doc_contents(svc, ['doc_a', 'doc_b', 'doc_a'])
+
+        self.assertEqual(self.executed, [('get', 'doc_a'), ('get', 'doc_b')])
+        self.assertEqual(results['doc_a'], content)
+        self.assertIsInstance(results['doc_b'], HttpError)
+
+    def test_ut27_process_events_uses_prefetched_docs(self):
+        """UT-27: Events are judged from one batched fetch; only the no-topics event is cancelled."""
+        no_topics = [SECTION_BREAK, TODAY_HEADING, _para('Notes')]
+        svc = self._make_docs_svc({'doc_empty': no_topics}, {('get', 'doc_bad'): _http_error(403)})
+        events = [
+            dict(_make_event(['doc_empty']), id='evt_empty'),
+            dict(_make_event(['doc_bad']), id='evt_bad'),
+            dict(_make_event(['doc_empty']), id='evt_empty_too'),
+        ]
+
+        with patch('calendar_service.cancel_event_occurrences') as mock_cancel:
+            canceller.process_events(events, MagicMock(), svc, TODAY)
+
+        self.assertEqual(svc.new_batch_http_request.call_count, 1)
+        self.assertEqual(self.executed, [('get', 'doc_empty'), ('get', 'doc_bad')])
+        cancelled = [event['id'] for event in mock_cancel.call_args[0][1]]
+        self.assertEqual(cancelled, ['evt_empty', 'evt_empty_too'])
+
+    def test_ut31_recurring_event_without_doc_makes_no_api_calls(self):
+        """UT-31: A recurring event with no doc is kept without any Docs or Calendar request."""
+        svc = self._make_docs_svc({}, {})
+        mock_cal = MagicMock()
+        event = dict(_make_event([]), id='evt_no_doc', recurringEventId='base_no_doc')
+
+        canceller.process_events([event], mock_cal, svc, TODAY)
+
+        self.assertEqual(svc.new_batch_http_request.call_count, 0)
+        self.assertEqual(self.executed, [])
+        self.assertEqual(mock_cal.events.return_value.patch.call_count, 0)
+        self.assertEqual(mock_cal.events.return_value.delete.call_count, 0)
 
 
 # ---------------------------------------------------------------------------
 # UT-10 .. UT-11  docs_service.extract_doc_ids_from_event
 # ---------------------------------------------------------------------------
 
+# A Docs URL whose ID alone is 2048 chars, over the 2048-char URL limit.
+_LONG_URL = 'https://docs.google.com/document/d/' + 'a' * 2048 + '/edit'
+
+
 class TestExtractDocIds(unittest.TestCase):
 
     def _event_with_url(self, url: str) -> dict:
@@ -307,14 +466,13 @@ class TestExtractDocIds(unittest.TestCase):
 
     def test_ut11_url_exceeding_max_length_is_rejected(self):
         """UT-11: fileUrl longer than 2048 chars → empty list."""
-        long_url = 'https://docs.google.com/document/d/' + 'a' * 2048 + '/edit'
-        event = self._event_with_url(long_url)
+        event = self._event_with_url(_LONG_URL)
         result = docs_service.extract_doc_ids_from_event(event)
         self.assertEqual(result, [])
 
 
 # ---------------------------------------------------------------------------
-# UT-12  auth.get_credentials — corrupt token recovery
+# UT-12, UT-20 .. UT-21  auth.get_credentials
 # ---------------------------------------------------------------------------
 
 class TestGetCredentials(unittest.TestCase):
@@ -355,7 +513,7 @@ class TestGetCredentials(unittest.TestCase):
             with (
                 patch.object(auth, 'TOKEN_PATH', corrupt_token),
                 patch.object(auth, 'CREDENTIALS_PATH', fake_creds_json),
-                patch('auth.InstalledAppFlow') as mock_flow_cls,
+                patch('google_auth_oauthlib.flow.InstalledAppFlow') as mock_flow_cls,
                 patch('auth._save_token'),  # avoid actual file write after re-auth
             ):
                 mock_flow_cls.from_client_secrets_file.return_value.run_local_server.return_value = (
@@ -370,41 +528,113 @@ class TestGetCredentials(unittest.TestCase):
             mock_flow_cls.from_client_secrets_file.assert_called_once()
             self.assertEqual(result, mock_new_creds)
 
+    def _write_cached_token(self, tmp_dir, expires_in):
+        """Write credentials.json and a token.json expiring in expires_in; return their paths."""
+        creds_path = os.path.join(tmp_dir, 'credentials.json')
+        with open(creds_path, 'w') as f:
+            json.dump({'installed': {'client_id': 'test.apps.googleusercontent.com'}}, f)
+
+        expiry = datetime.datetime.now(datetime.timezone.utc) + expires_in
+        token_path = os.path.join(tmp_dir, 'token.json')
+        with open(token_path, 'w') as f:
+            json.dump({
+                'token': 'cached_token',
+                'refresh_token': 'cached_refresh',
+                'token_uri': 'https://oauth2.googleapis.com/token',
+                'client_id': 'test.apps.googleusercontent.com',
+                'client_secret': 'test_secret',
+                'scopes': auth.SCOPES,
+                'expiry': expiry.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            }, f)
+        return creds_path, token_path
+
+    def test_ut20_fresh_cached_token_is_not_refreshed_or_rewritten(self):
+        """UT-20: A token with more than the refresh margin left is used as-is."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            creds_path, token_path = self._write_cached_token(
+                tmp_dir, datetime.timedelta(minutes=30)
+            )
+            with (
+                patch.object(auth, 'TOKEN_PATH', token_path),
+                patch.object(auth, 'CREDENTIALS_PATH', creds_path),
+                patch('google.oauth2.credentials.Credentials.refresh') as mock_refresh,
+                patch('auth._save_token') as mock_save,
+            ):
+                result = auth.get_credentials()
+
+            self.assertEqual(result.token, 'cached_token')
+            mock_refresh.assert_not_called()
+            mock_save.assert_not_called()
+
+    def test_ut21_token_inside_refresh_margin_is_refreshed(self):
+        """UT-21: A token about to expire is refreshed up front and saved."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            creds_path, token_path = self._write_cached_token(
+                tmp_dir, datetime.timedelta(minutes=4, seconds=30)
+            )
+            with (
+                patch.object(auth, 'TOKEN_PATH', token_path),
+                patch.object(auth, 'CREDENTIALS_PATH', creds_path),
+                patch('google.oauth2.credentials.Credentials.refresh') as mock_refresh,
+                patch('auth._save_token') as mock_save,
+            ):
+                auth.get_credentials()
+
+            mock_refresh.assert_called_once()
+            mock_save.assert_called_once()
+
 
 # ---------------------------------------------------------------------------
 # UT-14 .. UT-16  run-once-per-day guard (main._read_last_success /
 #                 _write_last_success / early-exit in main())
 # ---------------------------------------------------------------------------
 
-class TestRunOncePerDay(unittest.TestCase):
+# The date main.main() sees as "today" in these tests.
+RUN_DATE = datetime.date(2026, 2, 27)
 
-    def test_ut14_already_ran_today_exits_early(self):
-        """UT-14: last_success.txt contains today → main() exits before fetching events."""
-        today = datetime.date(2026, 2, 27)
 
+class TestRunOncePerDay(unittest.TestCase):
+
+    def setUp(self):
+        """Patch out auth, argv and the state files; tests set read_last.return_value."""
         # Fake creds / services so auth doesn't touch the filesystem.
-        mock_creds = MagicMock()
         mock_cal_svc = MagicMock()
-        mock_docs_svc = MagicMock()
         mock_cal_svc.settings.return_value.get.return_value.execute.return_value = {
             'value': 'UTC'
         }
+        self.read_last  = self._start(patch('main._read_last_success'))
+        self.write_last = self._start(patch('main._write_last_success'))
+        self._start(patch('main._read_cached_timezone', return_value=None))
+        self._start(patch('main._write_cached_timezone'))
+        self._start(patch('auth.get_credentials', return_value=MagicMock()))
+        self._start(patch('auth.build_services', return_value=(mock_cal_svc, MagicMock())))
+        # No recurring events today → nothing to cancel.
+        self.fetch = self._start(
+            patch('calendar_service.get_todays_recurring_events', return_value=[])
+        )
+        self._start(patch('sys.argv', ['main.py']))
+        # Pin "today" so the tests do not depend on the date they run on.
+        self._start(patch(
+            'main._clock',
+            side_effect=lambda tz: datetime.datetime.combine(RUN_DATE, datetime.time(9), tz),
+        ))
+
+    def _start(self, patcher):
+        mock = patcher.start()
+        self.addCleanup(patcher.stop)
+        return mock
 
-        with (
-            patch('main._read_last_success', return_value=today),
-            patch('main._write_last_success') as mock_write,
-            patch('auth.get_credentials', return_value=mock_creds),
-            patch('auth.build_services', return_value=(mock_cal_svc, mock_docs_svc, MagicMock())),
-            patch('calendar_service.get_todays_recurring_events') as mock_fetch,
-            patch('sys.argv', ['main.py']),
-        ):
-            with self.assertLogs('main', level='INFO') as log_ctx:
-                main.main()
+    def test_ut14_already_ran_today_exits_early(self):
+        """UT-14: last_success.txt contains today → main() exits before fetching events."""
+        self.read_last.return_value = RUN_DATE
+
+        with self.assertLogs('main', level='INFO') as log_ctx:
+            main.main()
 
         # Events must NOT have been fetched.
-        mock_fetch.assert_not_called()
+        self.fetch.assert_not_called()
         # Success file must NOT be overwritten.
-        mock_write.assert_not_called()
+        self.write_last.assert_not_called()
         self.assertTrue(
             any('already ran successfully today' in msg for msg in log_ctx.output),
             "Expected early-exit log message",
@@ -412,62 +642,53 @@ class TestRunOncePerDay(unittest.TestCase):
 
     def test_ut15_successful_run_writes_last_success(self):
         """UT-15: After a successful run, last_success.txt is written with today's date."""
-        mock_creds = MagicMock()
-        mock_cal_svc = MagicMock()
-        mock_docs_svc = MagicMock()
-        mock_cal_svc.settings.return_value.get.return_value.execute.return_value = {
-            'value': 'UTC'
-        }
-        # No recurring events today → nothing to cancel.
-        mock_cal_svc.events.return_value.list.return_value.execute.return_value = {
-            'items': []
-        }
+        self.read_last.return_value = None
 
-        with (
-            patch('main._read_last_success', return_value=None),
-            patch('main._write_last_success') as mock_write,
-            patch('auth.get_credentials', return_value=mock_creds),
-            patch('auth.build_services', return_value=(mock_cal_svc, mock_docs_svc, MagicMock())),
-            patch('sys.argv', ['main.py']),
-        ):
-            main.main()
+        main.main()
 
         # _write_last_success must have been called with today's date.
-        mock_write.assert_called_once()
-        written_date = mock_write.call_args[0][0]
-        self.assertIsInstance(written_date, datetime.date)
+        self.write_last.assert_called_once_with(RUN_DATE)
 
     def test_ut16_past_date_in_file_does_not_exit_early(self):
         """UT-16: last_success.txt contains yesterday → program proceeds normally."""
-        yesterday = datetime.date(2026, 2, 26)
-
-        mock_creds = MagicMock()
-        mock_cal_svc = MagicMock()
-        mock_docs_svc = MagicMock()
-        mock_cal_svc.settings.return_value.get.return_value.execute.return_value = {
-            'value': 'UTC'
-        }
-        mock_cal_svc.events.return_value.list.return_value.execute.return_value = {
-            'items': []
-        }
+        self.read_last.return_value = RUN_DATE - datetime.timedelta(days=1)
 
-        with (
-            patch('main._read_last_success', return_value=yesterday),
-            patch('main._write_last_success') as mock_write,
-            patch('auth.get_credentials', return_value=mock_creds),
-            patch('auth.build_services', return_value=(mock_cal_svc, mock_docs_svc, MagicMock())),
-            patch('calendar_service.get_todays_recurring_events') as mock_fetch,
-            patch('sys.argv', ['main.py']),
-        ):
-            mock_fetch.return_value = []
-            main.main()
+        main.main()
 
         # Events MUST have been fetched (program did not exit early).
-        mock_fetch.assert_called_once()
+        self.fetch.assert_called_once()
         # Success file MUST be written with today's (not yesterday's) date.
-        mock_write.assert_called_once()
-        written_date = mock_write.call_args[0][0]
-        self.assertNotEqual(written_date, yesterday)
+        self.write_last.assert_called_once_with(RUN_DATE)
+
+
+# ---------------------------------------------------------------------------
+# UT-23 .. UT-24  main timezone cache
+# ---------------------------------------------------------------------------
+
+class TestTimezoneCache(unittest.TestCase):
+
+    def test_ut23_fresh_cache_is_used_and_round_trips(self):
+        """UT-23: A freshly written timezone is read back without calling the API."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_path = os.path.join(tmp_dir, 'timezone_cache.txt')
+            with patch.object(main, 'TIMEZONE_CACHE_PATH', cache_path):
+                self.assertIsNone(main._read_cached_timezone())
+                main._write_cached_timezone('Asia/Colombo')
+                self.assertEqual(main._read_cached_timezone(), 'Asia/Colombo')
+                self.assertEqual(os.stat(cache_path).st_mode & 0o777, 0o600)
+
+    def test_ut24_stale_or_invalid_cache_is_ignored(self):
+        """UT-24: An expired or unrecognised cached timezone is treated as a miss."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_path = os.path.join(tmp_dir, 'timezone_cache.txt')
+            with patch.object(main, 'TIMEZONE_CACHE_PATH', cache_path):
+                main._write_cached_timezone('Asia/Colombo')
+                stale = time.time() - main._TIMEZONE_CACHE_TTL_SECONDS - 60
+                os.utime(cache_path, (stale, stale))
+                self.assertIsNone(main._read_cached_timezone())
+
+                main._write_cached_timezone('Not/A_Zone')
+                self.assertIsNone(main._read_cached_timezone())
 
 
 # ---------------------------------------------------------------------------